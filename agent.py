@@ -6,18 +6,38 @@ Core agent interaction functions for running autonomous coding sessions.
 """
 
 import asyncio
+import math
 from pathlib import Path
 from typing import Optional
 
-from claude_code_sdk import ClaudeSDKClient
+from claude_code_sdk import (
+    AssistantMessage,
+    ClaudeSDKClient,
+    TextBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
 
 from client import create_client
-from progress import print_session_header, print_progress_summary
+from progress import (
+    HEAVY_RULE,
+    LIGHT_RULE,
+    print_session_header,
+    print_progress_summary,
+)
 from prompts import get_initializer_prompt, get_coding_prompt, copy_spec_to_project
 
 
 # Configuration
 AUTO_CONTINUE_DELAY_SECONDS = 3
+MAX_ERROR_RETRY_DELAY_SECONDS = 60
+ERROR_BACKOFF_FACTOR = 1.5
+
+
+def truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with "..."."""
+    return text if len(text) <= limit else text[:limit] + "..."
 
 
 async def run_agent_session(
@@ -45,49 +65,40 @@ async def run_agent_session(
         await client.query(message)
 
         # Collect response text and show tool use
-        response_text = ""
+        response_parts = []
         async for msg in client.receive_response():
-            msg_type = type(msg).__name__
-
             # Handle AssistantMessage (text and tool use)
-            if msg_type == "AssistantMessage" and hasattr(msg, "content"):
+            if isinstance(msg, AssistantMessage):
                 for block in msg.content:
-                    block_type = type(block).__name__
-
-                    if block_type == "TextBlock" and hasattr(block, "text"):
-                        response_text += block.text
+                    if isinstance(block, TextBlock):
+                        response_parts.append(block.text)
                         print(block.text, end="", flush=True)
-                    elif block_type == "ToolUseBlock" and hasattr(block, "name"):
-                        print(f"\n[Tool: {block.name}]", flush=True)
-                        if hasattr(block, "input"):
-                            input_str = str(block.input)
-                            if len(input_str) > 200:
-                                print(f"   Input: {input_str[:200]}...", flush=True)
-                            else:
-                                print(f"   Input: {input_str}", flush=True)
+                    elif isinstance(block, ToolUseBlock):
+                        # Show tool name and truncated input
+                        print(
+                            f"\n[Tool: {block.name}]\n   Input: {truncate(str(block.input), 200)}",
+                            flush=True,
+                        )
 
             # Handle UserMessage (tool results)
-            elif msg_type == "UserMessage" and hasattr(msg, "content"):
+            elif isinstance(msg, UserMessage) and isinstance(msg.content, list):
                 for block in msg.content:
-                    block_type = type(block).__name__
-
-                    if block_type == "ToolResultBlock":
-                        result_content = getattr(block, "content", "")
-                        is_error = getattr(block, "is_error", False)
+                    if isinstance(block, ToolResultBlock):
+                        result_content = block.content
+                        is_error = block.is_error
 
                         # Check if command was blocked by security hook
                         if "blocked" in str(result_content).lower():
                             print(f"   [BLOCKED] {result_content}", flush=True)
                         elif is_error:
                             # Show errors (truncated)
-                            error_str = str(result_content)[:500]
-                            print(f"   [Error] {error_str}", flush=True)
+                            print(f"   [Error] {truncate(str(result_content), 500)}", flush=True)
                         else:
                             # Tool succeeded - just show brief confirmation
                             print("   [Done]", flush=True)
 
-        print("\n" + "-" * 70 + "\n")
-        return "continue", response_text
+        print("\n" + LIGHT_RULE + "\n")
+        return "continue", "".join(response_parts)
 
     except Exception as e:
         print(f"Error during agent session: {e}")
@@ -107,16 +118,16 @@ async def run_autonomous_agent(
         model: Claude model to use
         max_iterations: Maximum number of iterations (None for unlimited)
     """
-    print("\n" + "=" * 70)
-    print("  AUTONOMOUS CODING AGENT DEMO")
-    print("=" * 70)
-    print(f"\nProject directory: {project_dir}")
-    print(f"Model: {model}")
-    if max_iterations:
-        print(f"Max iterations: {max_iterations}")
-    else:
-        print("Max iterations: Unlimited (will run until completion)")
-    print()
+    print("\n".join([
+        "\n" + HEAVY_RULE,
+        "  AUTONOMOUS CODING AGENT DEMO",
+        HEAVY_RULE,
+        f"\nProject directory: {project_dir}",
+        f"Model: {model}",
+        f"Max iterations: {max_iterations}" if max_iterations
+        else "Max iterations: Unlimited (will run until completion)",
+        "",
+    ]))
 
     # Create project directory
     project_dir.mkdir(parents=True, exist_ok=True)
@@ -126,22 +137,25 @@ async def run_autonomous_agent(
     is_first_run = not tests_file.exists()
 
     if is_first_run:
-        print("Fresh start - will use initializer agent")
-        print()
-        print("=" * 70)
-        print("  NOTE: First session takes 10-20+ minutes!")
-        print("  The agent is generating 200 detailed test cases.")
-        print("  This may appear to hang - it's working. Watch for [Tool: ...] output.")
-        print("=" * 70)
-        print()
+        print("\n".join([
+            "Fresh start - will use initializer agent",
+            "",
+            HEAVY_RULE,
+            "  NOTE: First session takes 10-20+ minutes!",
+            "  The agent is generating 200 detailed test cases.",
+            "  This may appear to hang - it's working. Watch for [Tool: ...] output.",
+            HEAVY_RULE,
+            "",
+        ]))
         # Copy the app spec into the project directory for the agent to read
         copy_spec_to_project(project_dir)
     else:
         print("Continuing existing project")
-        print_progress_summary(project_dir)
+        await asyncio.to_thread(print_progress_summary, project_dir)
 
     # Main loop
     iteration = 0
+    error_delay = AUTO_CONTINUE_DELAY_SECONDS
 
     while True:
         iteration += 1
@@ -169,38 +183,57 @@ async def run_autonomous_agent(
         async with client:
             status, response = await run_agent_session(client, prompt, project_dir)
 
+        # No next session to wait for once the iteration budget is used up
+        is_last_session = bool(max_iterations) and iteration >= max_iterations
+
         # Handle status
         if status == "continue":
-            print(f"\nAgent will auto-continue in {AUTO_CONTINUE_DELAY_SECONDS}s...")
-            print_progress_summary(project_dir)
-            await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
+            # Successful session - reset the retry backoff
+            error_delay = AUTO_CONTINUE_DELAY_SECONDS
+            if not is_last_session:
+                print(f"\nAgent will auto-continue in {AUTO_CONTINUE_DELAY_SECONDS}s...")
+            # Off the event loop: reads feature_list.json and may POST the webhook
+            await asyncio.to_thread(print_progress_summary, project_dir)
+            if not is_last_session:
+                await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
 
         elif status == "error":
+            # Back off on consecutive errors so a persistent failure
+            # (API outage, rate limit) doesn't burn sessions in a tight loop
             print("\nSession encountered an error")
-            print("Will retry with a fresh session...")
-            await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
+            if not is_last_session:
+                print(f"Will retry with a fresh session in {error_delay}s...")
+                await asyncio.sleep(error_delay)
+                error_delay = min(
+                    MAX_ERROR_RETRY_DELAY_SECONDS,
+                    math.ceil(error_delay * ERROR_BACKOFF_FACTOR),
+                )
 
         # Small delay between sessions
-        if max_iterations is None or iteration < max_iterations:
+        if not is_last_session:
             print("\nPreparing next session...\n")
             await asyncio.sleep(1)
 
     # Final summary
-    print("\n" + "=" * 70)
-    print("  SESSION COMPLETE")
-    print("=" * 70)
-    print(f"\nProject directory: {project_dir}")
-    print_progress_summary(project_dir)
+    print("\n".join([
+        "\n" + HEAVY_RULE,
+        "  SESSION COMPLETE",
+        HEAVY_RULE,
+        f"\nProject directory: {project_dir}",
+    ]))
+    await asyncio.to_thread(print_progress_summary, project_dir)
 
     # Print instructions for running the generated application
-    print("\n" + "-" * 70)
-    print("  TO RUN THE GENERATED APPLICATION:")
-    print("-" * 70)
-    print(f"\n  cd {project_dir.resolve()}")
-    print("  ./init.sh           # Run the setup script")
-    print("  # Or manually:")
-    print("  npm install && npm run dev")
-    print("\n  Then open http://localhost:3000 (or check init.sh for the URL)")
-    print("-" * 70)
+    print("\n".join([
+        "\n" + LIGHT_RULE,
+        "  TO RUN THE GENERATED APPLICATION:",
+        LIGHT_RULE,
+        f"\n  cd {project_dir.resolve()}",
+        "  ./init.sh           # Run the setup script",
+        "  # Or manually:",
+        "  npm install && npm run dev",
+        "\n  Then open http://localhost:3000 (or check init.sh for the URL)",
+        LIGHT_RULE,
+    ]))
 
     print("\nDone!")
@@ -19,12 +19,6 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
-# Load environment variables from .env file (if it exists)
-# IMPORTANT: Must be called BEFORE importing other modules that read env vars at load time
-load_dotenv()
-
-from agent import run_autonomous_agent
-
 
 # Configuration
 # DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
@@ -83,6 +77,10 @@ def main() -> None:
     """Main entry point."""
     args = parse_args()
 
+    # Load environment variables from .env file (if it exists)
+    # IMPORTANT: Must be called BEFORE importing other modules that read env vars at load time
+    load_dotenv()
+
     # Check for API key
     if not os.environ.get("ANTHROPIC_API_KEY") and not os.environ.get("CLAUDE_CODE_OAUTH_TOKEN"):
         print("Error: ANTHROPIC_API_KEY environment variable not set")
@@ -103,6 +101,9 @@ def main() -> None:
             # Prepend generations/ to relative paths
             project_dir = Path("generations") / project_dir
 
+    # Imported here so --help and the auth check don't pay for loading the SDK
+    from agent import run_autonomous_agent
+
     # Run the agent
     try:
         asyncio.run(
@@ -16,7 +16,7 @@ from security import bash_security_hook
 
 
 # Playwright MCP tools for browser automation (no screenshots for speed)
-PLAYWRIGHT_TOOLS = [
+PLAYWRIGHT_TOOLS = (
     # Core navigation & snapshots
     "mcp__playwright__browser_navigate",
     "mcp__playwright__browser_snapshot",
@@ -38,17 +38,49 @@ PLAYWRIGHT_TOOLS = [
     "mcp__playwright__browser_evaluate",
     "mcp__playwright__browser_run_code",
     "mcp__playwright__browser_close",
-]
+)
 
 # Built-in tools
-BUILTIN_TOOLS = [
+BUILTIN_TOOLS = (
     "Read",
     "Write",
     "Edit",
     "Glob",
     "Grep",
     "Bash",
-]
+)
+
+# Every tool the agent may call
+ALLOWED_TOOLS = BUILTIN_TOOLS + PLAYWRIGHT_TOOLS
+
+# Per-project settings file passed to the SDK
+SETTINGS_FILENAME = ".claude_settings.json"
+
+# Comprehensive security settings
+# Note: Using relative paths ("./**") restricts access to project directory
+# since cwd is set to project_dir
+SECURITY_SETTINGS = {
+    "sandbox": {"enabled": True, "autoAllowBashIfSandboxed": True},
+    "permissions": {
+        "defaultMode": "acceptEdits",  # Auto-approve edits within allowed directories
+        "allow": [
+            # Allow all file operations within the project directory
+            "Read(./**)",
+            "Write(./**)",
+            "Edit(./**)",
+            "Glob(./**)",
+            "Grep(./**)",
+            # Bash permission granted here, but actual commands are validated
+            # by the bash_security_hook (see security.py for allowed commands)
+            "Bash(*)",
+            # Allow Playwright MCP tools for browser automation
+            *PLAYWRIGHT_TOOLS,
+        ],
+    },
+}
+
+# Serialized security settings, as written to SETTINGS_FILENAME
+_SECURITY_SETTINGS_BYTES = json.dumps(SECURITY_SETTINGS, indent=2).encode("utf-8")
 
 
 def create_client(project_dir: Path, model: str) -> ClaudeSDKClient:
@@ -76,52 +108,35 @@ def create_client(project_dir: Path, model: str) -> ClaudeSDKClient:
             "or CLAUDE_CODE_OAUTH_TOKEN (Claude Code auth token from `claude setup-token`)."
         )
 
-    # Create comprehensive security settings
-    # Note: Using relative paths ("./**") restricts access to project directory
-    # since cwd is set to project_dir
-    security_settings = {
-        "sandbox": {"enabled": True, "autoAllowBashIfSandboxed": True},
-        "permissions": {
-            "defaultMode": "acceptEdits",  # Auto-approve edits within allowed directories
-            "allow": [
-                # Allow all file operations within the project directory
-                "Read(./**)",
-                "Write(./**)",
-                "Edit(./**)",
-                "Glob(./**)",
-                "Grep(./**)",
-                # Bash permission granted here, but actual commands are validated
-                # by the bash_security_hook (see security.py for allowed commands)
-                "Bash(*)",
-                # Allow Playwright MCP tools for browser automation
-                *PLAYWRIGHT_TOOLS,
-            ],
-        },
-    }
-
     # Ensure project directory exists before creating settings file
     project_dir.mkdir(parents=True, exist_ok=True)
-
-    # Write settings to a file in the project directory
-    settings_file = project_dir / ".claude_settings.json"
-    with open(settings_file, "w") as f:
-        json.dump(security_settings, f, indent=2)
-
-    print(f"Created security settings at {settings_file}")
-    print("   - Sandbox enabled (OS-level bash isolation)")
-    print(f"   - Filesystem restricted to: {project_dir.resolve()}")
-    print("   - Bash commands restricted to allowlist (see security.py)")
-    print("   - MCP servers: playwright (browser automation)")
-    print()
+    # Absolute project path, used for cwd and the settings file
+    resolved_dir = project_dir.resolve()
+
+    # Write settings to a file in the project directory, skipping the rewrite
+    # when a previous session already left identical contents
+    settings_file = project_dir / SETTINGS_FILENAME
+    try:
+        settings_unchanged = settings_file.read_bytes() == _SECURITY_SETTINGS_BYTES
+    except OSError:
+        settings_unchanged = False
+    if not settings_unchanged:
+        settings_file.write_bytes(_SECURITY_SETTINGS_BYTES)
+
+    print("\n".join([
+        f"{'Using' if settings_unchanged else 'Created'} security settings at {settings_file}",
+        "   - Sandbox enabled (OS-level bash isolation)",
+        f"   - Filesystem restricted to: {resolved_dir}",
+        "   - Bash commands restricted to allowlist (see security.py)",
+        "   - MCP servers: playwright (browser automation)",
+        "",
+    ]))
 
     return ClaudeSDKClient(
         options=ClaudeCodeOptions(
             model=model,
             system_prompt="You are an expert full-stack developer building a production-quality web application.",
-            allowed_tools=[
-                *BUILTIN_TOOLS,
-                *PLAYWRIGHT_TOOLS,
-            ],
+            allowed_tools=list(ALLOWED_TOOLS),
             mcp_servers={
                 "playwright": {"command": "npx", "args": ["@playwright/mcp@latest", "--headless"]}
                 # "playwright": {"command": "npx", "args": ["@playwright/mcp@latest", "--viewport-size", "1280x720"]}
@@ -132,7 +147,7 @@ def create_client(project_dir: Path, model: str) -> ClaudeSDKClient:
                 ],
             },
             max_turns=1000,
-            cwd=str(project_dir.resolve()),
-            settings=str(settings_file.resolve()),  # Use absolute path
+            cwd=str(resolved_dir),
+            settings=str(resolved_dir / SETTINGS_FILENAME),  # Use absolute path
         )
     )
@@ -11,10 +11,66 @@ import urllib.request
 from datetime import datetime
 from pathlib import Path
 
+try:
+    # Optional: orjson parses large feature lists several times faster
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 
 WEBHOOK_URL = os.environ.get("PROGRESS_N8N_WEBHOOK_URL")
 PROGRESS_CACHE_FILE = ".progress_cache"
 
+# Separator rules for console banners
+HEAVY_RULE = "=" * 70
+LIGHT_RULE = "-" * 70
+
+# Parsed feature_list.json contents, keyed by path and invalidated by mtime/size
+_feature_list_cache: dict[Path, tuple[tuple[int, int], list]] = {}
+
+
+def load_feature_list(tests_file: Path) -> list:
+    """
+    Load feature_list.json, reusing the parsed list while the file is unchanged.
+
+    The progress summary and webhook both read the same file after every
+    session; the mtime check turns repeat reads into a single stat().
+
+    Raises:
+        OSError: If the file cannot be read
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    st = tests_file.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _feature_list_cache.get(tests_file)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    tests = _json_loads(tests_file.read_bytes())
+    _feature_list_cache[tests_file] = (key, tests)
+    return tests
+
+
+def write_progress_cache(cache_file: Path, passing: int, passing_indices: list[int]) -> None:
+    """
+    Atomically replace the progress cache.
+
+    Writes a sibling temp file and renames it into place, so an interrupted
+    run can never leave a truncated cache that would reset the baseline and
+    re-announce already-passing tests.
+    """
+    tmp_file = cache_file.with_name(f"{cache_file.name}.tmp.{os.getpid()}")
+    try:
+        tmp_file.write_text(json.dumps({
+            "count": passing,
+            "passing_indices": passing_indices
+        }))
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        # Don't leave the temp file behind for the agent to commit
+        tmp_file.unlink(missing_ok=True)
+        raise
+
 
 def send_progress_webhook(passing: int, total: int, project_dir: Path) -> None:
     """Send webhook notification when progress increases."""
@@ -26,13 +82,14 @@ def send_progress_webhook(passing: int, total: int, project_dir: Path) -> None:
     previous_passing_tests = set()
 
     # Read previous progress and passing test indices
-    if cache_file.exists():
-        try:
-            cache_data = json.loads(cache_file.read_text())
-            previous = cache_data.get("count", 0)
-            previous_passing_tests = set(cache_data.get("passing_indices", []))
-        except:
-            previous = 0
+    try:
+        cache_data = json.loads(cache_file.read_bytes())
+        previous = cache_data.get("count", 0)
+        previous_passing_tests = set(cache_data.get("passing_indices", []))
+    except FileNotFoundError:
+        pass
+    except:
+        previous = 0
 
     # Only notify if progress increased
     if passing > previous:
@@ -41,23 +98,21 @@ def send_progress_webhook(passing: int, total: int, project_dir: Path) -> None:
         completed_tests = []
         current_passing_indices = []
 
-        if tests_file.exists():
-            try:
-                with open(tests_file, "r") as f:
-                    tests = json.load(f)
-                for i, test in enumerate(tests):
-                    if test.get("passes", False):
-                        current_passing_indices.append(i)
-                        if i not in previous_passing_tests:
-                            # This test is newly passing
-                            desc = test.get("description", f"Test #{i+1}")
-                            category = test.get("category", "")
-                            if category:
-                                completed_tests.append(f"[{category}] {desc}")
-                            else:
-                                completed_tests.append(desc)
-            except:
-                pass
+        try:
+            tests = load_feature_list(tests_file)
+            for i, test in enumerate(tests):
+                if test.get("passes", False):
+                    current_passing_indices.append(i)
+                    if i not in previous_passing_tests:
+                        # This test is newly passing
+                        desc = test.get("description", f"Test #{i+1}")
+                        category = test.get("category", "")
+                        if category:
+                            completed_tests.append(f"[{category}] {desc}")
+                        else:
+                            completed_tests.append(desc)
+        except:
+            pass
 
         payload = {
             "event": "test_progress",
@@ -82,28 +137,20 @@ def send_progress_webhook(passing: int, total: int, project_dir: Path) -> None:
             print(f"[Webhook notification failed: {e}]")
 
         # Update cache with count and passing indices
-        cache_file.write_text(json.dumps({
-            "count": passing,
-            "passing_indices": current_passing_indices
-        }))
+        write_progress_cache(cache_file, passing, current_passing_indices)
     else:
         # Update cache even if no change (for initial state)
         if not cache_file.exists():
             tests_file = project_dir / "feature_list.json"
             current_passing_indices = []
-            if tests_file.exists():
-                try:
-                    with open(tests_file, "r") as f:
-                        tests = json.load(f)
-                    for i, test in enumerate(tests):
-                        if test.get("passes", False):
-                            current_passing_indices.append(i)
-                except:
-                    pass
-            cache_file.write_text(json.dumps({
-                "count": passing,
-                "passing_indices": current_passing_indices
-            }))
+            try:
+                tests = load_feature_list(tests_file)
+                for i, test in enumerate(tests):
+                    if test.get("passes", False):
+                        current_passing_indices.append(i)
+            except:
+                pass
+            write_progress_cache(cache_file, passing, current_passing_indices)
 
 
 def count_passing_tests(project_dir: Path) -> tuple[int, int]:
@@ -118,12 +165,8 @@ def count_passing_tests(project_dir: Path) -> tuple[int, int]:
     """
     tests_file = project_dir / "feature_list.json"
 
-    if not tests_file.exists():
-        return 0, 0
-
     try:
-        with open(tests_file, "r") as f:
-            tests = json.load(f)
+        tests = load_feature_list(tests_file)
 
         total = len(tests)
         passing = sum(1 for test in tests if test.get("passes", False))
@@ -137,10 +180,12 @@ def print_session_header(session_num: int, is_initializer: bool) -> None:
     """Print a formatted header for the session."""
     session_type = "INITIALIZER" if is_initializer else "CODING AGENT"
 
-    print("\n" + "=" * 70)
-    print(f"  SESSION {session_num}: {session_type}")
-    print("=" * 70)
-    print()
+    print("\n".join([
+        "\n" + HEAVY_RULE,
+        f"  SESSION {session_num}: {session_type}",
+        HEAVY_RULE,
+        "",
+    ]))
 
 
 def print_progress_summary(project_dir: Path) -> None:
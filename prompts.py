@@ -6,16 +6,23 @@ Functions for loading prompt templates from the prompts directory.
 """
 
 import shutil
+from functools import lru_cache
 from pathlib import Path
 
 
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 
 
+@lru_cache(maxsize=8)
+def _read_prompt(prompt_path: Path, mtime_ns: int) -> str:
+    """Read a prompt file; cached per (path, mtime) so edits are still picked up."""
+    return prompt_path.read_text()
+
+
 def load_prompt(name: str) -> str:
     """Load a prompt template from the prompts directory."""
     prompt_path = PROMPTS_DIR / f"{name}.md"
-    return prompt_path.read_text()
+    return _read_prompt(prompt_path, prompt_path.stat().st_mtime_ns)
 
 
 def get_initializer_prompt() -> str:
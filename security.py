@@ -7,12 +7,13 @@ Uses an allowlist approach - only explicitly permitted commands can run.
 """
 
 import os
+import re
 import shlex
 
 
 # Allowed commands for development tasks
 # Minimal set needed for the autonomous coding demo
-ALLOWED_COMMANDS = {
+ALLOWED_COMMANDS = frozenset({
     # File inspection
     "ls",
     "cat",
@@ -52,65 +53,110 @@ ALLOWED_COMMANDS = {
     "bash",
     # Script execution
     "init.sh",  # Init scripts; validated separately
-}
+})
 
 # Commands that need additional validation even when in the allowlist
-COMMANDS_NEEDING_EXTRA_VALIDATION = {"pkill", "chmod", "init.sh"}
+COMMANDS_NEEDING_EXTRA_VALIDATION = frozenset({"pkill", "chmod", "init.sh"})
 
-
-def split_command_segments(command_string: str) -> list[str]:
+# Process names pkill may target
+PKILL_ALLOWED_PROCESSES = frozenset({
+    "node",
+    "npm",
+    "npx",
+    "vite",
+    "next",
+})
+
+# Shell operators that end one command and start the next
+_SHELL_OPERATORS = frozenset({"|", "||", "&&", "&"})
+
+# Shell keywords that can precede a command name
+_SHELL_KEYWORDS = frozenset({
+    "if",
+    "then",
+    "else",
+    "elif",
+    "fi",
+    "for",
+    "while",
+    "until",
+    "do",
+    "done",
+    "case",
+    "esac",
+    "in",
+    "!",
+    "{",
+    "}",
+})
+
+# chmod modes that only add execute permission: +x, u+x, a+x, ug+x, ...
+_CHMOD_EXEC_MODE_RE = re.compile(r"^[ugoa]*\+x$")
+
+
+def split_command_chain(command_string: str) -> list[str]:
     """
-    Split a compound command into individual command segments.
+    Split a command on ;, && and || that appear outside quotes.
 
-    Handles command chaining (&&, ||, ;) but not pipes (those are single commands).
+    A single left-to-right scan that tracks quoting and backslash escapes,
+    so separators inside quoted arguments (e.g. commit messages) are kept.
+    Pipes and & are left in place for the token pass in parse_segments.
 
     Args:
         command_string: The full shell command
 
     Returns:
-        List of individual command segments
+        List of raw segments (may include empty strings)
     """
-    import re
-
-    # Split on && and || while preserving the ability to handle each segment
-    # This regex splits on && or || that aren't inside quotes
-    segments = re.split(r"\s*(?:&&|\|\|)\s*", command_string)
-
-    # Further split on semicolons
-    result = []
-    for segment in segments:
-        sub_segments = re.split(r'(?<!["\'])\s*;\s*(?!["\'])', segment)
-        for sub in sub_segments:
-            sub = sub.strip()
-            if sub:
-                result.append(sub)
-
-    return result
-
-
-def extract_commands(command_string: str) -> list[str]:
+    segments = []
+    start = 0
+    quote = None
+    i = 0
+    n = len(command_string)
+
+    while i < n:
+        ch = command_string[i]
+        if quote:
+            if ch == quote:
+                quote = None
+            elif ch == "\\" and quote == '"':
+                i += 1  # Escaped character inside double quotes
+        elif ch == "'" or ch == '"':
+            quote = ch
+        elif ch == "\\":
+            i += 1  # Escaped character, e.g. \;
+        elif ch == ";":
+            segments.append(command_string[start:i])
+            start = i + 1
+        elif ch in "&|" and command_string[i + 1 : i + 2] == ch:
+            segments.append(command_string[start:i])
+            i += 1
+            start = i + 1
+        i += 1
+
+    segments.append(command_string[start:])
+    return segments
+
+
+def parse_segments(command_string: str) -> list[tuple[str, list[str]]]:
     """
-    Extract command names from a shell command string.
+    Tokenize a shell command into (command_name, tokens) pairs.
 
-    Handles pipes, command chaining (&&, ||, ;), and subshells.
-    Returns the base command names (without paths).
+    Handles pipes, command chaining (&&, ||, ;), and subshells. Each pair holds
+    the base command name (without path) and the tokens of the simple command
+    it heads, for the per-command validators.
 
     Args:
         command_string: The full shell command
 
     Returns:
-        List of command names found in the string
+        List of (command_name, tokens) pairs, or an empty list if the
+        command could not be parsed
     """
-    commands = []
-
-    # shlex doesn't treat ; as a separator, so we need to pre-process
-    import re
-
-    # Split on semicolons that aren't inside quotes (simple heuristic)
-    # This handles common cases like "echo hello; ls"
-    segments = re.split(r'(?<!["\'])\s*;\s*(?!["\'])', command_string)
+    result = []
 
-    for segment in segments:
+    # shlex doesn't treat ;, && or || as separators, so split those first
+    for segment in split_command_chain(command_string):
         segment = segment.strip()
         if not segment:
             continue
@@ -127,32 +173,23 @@ def extract_commands(command_string: str) -> list[str]:
 
         # Track when we expect a command vs arguments
         expect_command = True
+        cmd = None
+        group = []
 
         for token in tokens:
             # Shell operators indicate a new command follows
-            if token in ("|", "||", "&&", "&"):
+            if token in _SHELL_OPERATORS:
+                if cmd is not None:
+                    result.append((cmd, group))
                 expect_command = True
+                cmd = None
+                group = []
                 continue
 
+            group.append(token)
+
             # Skip shell keywords that precede commands
-            if token in (
-                "if",
-                "then",
-                "else",
-                "elif",
-                "fi",
-                "for",
-                "while",
-                "until",
-                "do",
-                "done",
-                "case",
-                "esac",
-                "in",
-                "!",
-                "{",
-                "}",
-            ):
+            if token in _SHELL_KEYWORDS:
                 continue
 
             # Skip flags/options
@@ -166,35 +203,43 @@ def extract_commands(command_string: str) -> list[str]:
             if expect_command:
                 # Extract the base command name (handle paths like /usr/bin/python)
                 cmd = os.path.basename(token)
-                commands.append(cmd)
                 expect_command = False
 
-    return commands
+        if cmd is not None:
+            result.append((cmd, group))
+
+    return result
 
 
-def validate_pkill_command(command_string: str) -> tuple[bool, str]:
+def extract_commands(command_string: str) -> list[str]:
+    """
+    Extract command names from a shell command string.
+
+    Handles pipes, command chaining (&&, ||, ;), and subshells.
+    Returns the base command names (without paths).
+
+    Args:
+        command_string: The full shell command
+
+    Returns:
+        List of command names found in the string
+    """
+    return [cmd for cmd, _ in parse_segments(command_string)]
+
+
+def validate_pkill_command(tokens: list[str]) -> tuple[bool, str]:
     """
     Validate pkill commands - only allow killing dev-related processes.
 
-    Uses shlex to parse the command, avoiding regex bypass vulnerabilities.
+    Works on shlex tokens rather than the raw string, avoiding regex bypass
+    vulnerabilities.
+
+    Args:
+        tokens: The pkill command split into shell tokens
 
     Returns:
         Tuple of (is_allowed, reason_if_blocked)
     """
-    # Allowed process names for pkill
-    allowed_process_names = {
-        "node",
-        "npm",
-        "npx",
-        "vite",
-        "next",
-    }
-
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
-        return False, "Could not parse pkill command"
-
     if not tokens:
         return False, "Empty pkill command"
 
@@ -215,23 +260,21 @@ def validate_pkill_command(command_string: str) -> tuple[bool, str]:
     if " " in target:
         target = target.split()[0]
 
-    if target in allowed_process_names:
+    if target in PKILL_ALLOWED_PROCESSES:
         return True, ""
-    return False, f"pkill only allowed for dev processes: {allowed_process_names}"
+    return False, f"pkill only allowed for dev processes: {', '.join(sorted(PKILL_ALLOWED_PROCESSES))}"
 
 
-def validate_chmod_command(command_string: str) -> tuple[bool, str]:
+def validate_chmod_command(tokens: list[str]) -> tuple[bool, str]:
     """
     Validate chmod commands - only allow making files executable with +x.
 
+    Args:
+        tokens: The chmod command split into shell tokens
+
     Returns:
         Tuple of (is_allowed, reason_if_blocked)
     """
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
-        return False, "Could not parse chmod command"
-
     if not tokens or tokens[0] != "chmod":
         return False, "Not a chmod command"
 
@@ -257,26 +300,22 @@ def validate_chmod_command(command_string: str) -> tuple[bool, str]:
 
     # Only allow +x variants (making files executable)
     # This matches: +x, u+x, g+x, o+x, a+x, ug+x, etc.
-    import re
-
-    if not re.match(r"^[ugoa]*\+x$", mode):
+    if not _CHMOD_EXEC_MODE_RE.match(mode):
         return False, f"chmod only allowed with +x mode, got: {mode}"
 
     return True, ""
 
 
-def validate_init_script(command_string: str) -> tuple[bool, str]:
+def validate_init_script(tokens: list[str]) -> tuple[bool, str]:
     """
     Validate init.sh script execution - only allow ./init.sh.
 
+    Args:
+        tokens: The init script command split into shell tokens
+
     Returns:
         Tuple of (is_allowed, reason_if_blocked)
     """
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
-        return False, "Could not parse init script command"
-
     if not tokens:
         return False, "Empty command"
 
@@ -290,84 +329,71 @@ def validate_init_script(command_string: str) -> tuple[bool, str]:
     return False, f"Only ./init.sh is allowed, got: {script}"
 
 
-def get_command_for_validation(cmd: str, segments: list[str]) -> str:
-    """
-    Find the specific command segment that contains the given command.
-
-    Args:
-        cmd: The command name to find
-        segments: List of command segments
-
-    Returns:
-        The segment containing the command, or empty string if not found
-    """
-    for segment in segments:
-        segment_commands = extract_commands(segment)
-        if cmd in segment_commands:
-            return segment
-    return ""
-
-
-async def bash_security_hook(input_data, tool_use_id=None, context=None):
+def validate_bash_command(command: str) -> dict:
     """
-    Pre-tool-use hook that validates bash commands using an allowlist.
-
-    Only commands in ALLOWED_COMMANDS are permitted.
+    Validate a bash command against the allowlist (synchronous core of the hook).
 
     Args:
-        input_data: Dict containing tool_name and tool_input
-        tool_use_id: Optional tool use ID
-        context: Optional context
+        command: The full shell command
 
     Returns:
         Empty dict to allow, or {"decision": "block", "reason": "..."} to block
     """
-    if input_data.get("tool_name") != "Bash":
-        return {}
-
-    command = input_data.get("tool_input", {}).get("command", "")
     if not command:
         return {}
 
-    # Extract all commands from the command string
-    commands = extract_commands(command)
+    # Each command paired with the tokens of the segment it heads
+    segments = parse_segments(command)
 
-    if not commands:
+    if not segments:
         # Could not parse - fail safe by blocking
         return {
             "decision": "block",
             "reason": f"Could not parse command for security validation: {command}",
         }
 
-    # Split into segments for per-command validation
-    segments = split_command_segments(command)
-
     # Check each command against the allowlist
-    for cmd in commands:
+    for cmd, cmd_tokens in segments:
         if cmd not in ALLOWED_COMMANDS:
             return {
                 "decision": "block",
                 "reason": f"Command '{cmd}' is not in the allowed commands list",
             }
 
-        # Additional validation for sensitive commands
+        # Additional validation for sensitive commands, against the
+        # tokens of the segment that command actually heads
         if cmd in COMMANDS_NEEDING_EXTRA_VALIDATION:
-            # Find the specific segment containing this command
-            cmd_segment = get_command_for_validation(cmd, segments)
-            if not cmd_segment:
-                cmd_segment = command  # Fallback to full command
-
             if cmd == "pkill":
-                allowed, reason = validate_pkill_command(cmd_segment)
+                allowed, reason = validate_pkill_command(cmd_tokens)
                 if not allowed:
                     return {"decision": "block", "reason": reason}
             elif cmd == "chmod":
-                allowed, reason = validate_chmod_command(cmd_segment)
+                allowed, reason = validate_chmod_command(cmd_tokens)
                 if not allowed:
                     return {"decision": "block", "reason": reason}
             elif cmd == "init.sh":
-                allowed, reason = validate_init_script(cmd_segment)
+                allowed, reason = validate_init_script(cmd_tokens)
                 if not allowed:
                     return {"decision": "block", "reason": reason}
 
     return {}
+
+
+async def bash_security_hook(input_data, tool_use_id=None, context=None):
+    """
+    Pre-tool-use hook that validates bash commands using an allowlist.
+
+    Only commands in ALLOWED_COMMANDS are permitted.
+
+    Args:
+        input_data: Dict containing tool_name and tool_input
+        tool_use_id: Optional tool use ID
+        context: Optional context
+
+    Returns:
+        Empty dict to allow, or {"decision": "block", "reason": "..."} to block
+    """
+    if input_data.get("tool_name") != "Bash":
+        return {}
+
+    return validate_bash_command(input_data.get("tool_input", {}).get("command", ""))
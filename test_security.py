@@ -8,6 +8,7 @@ Run with: python test_security.py
 """
 
 import asyncio
+import shlex
 import sys
 
 from security import (
@@ -54,6 +55,9 @@ def test_extract_commands():
         ("/usr/bin/node script.js", ["node"]),
         ("VAR=value ls", ["ls"]),
         ("git status || git init", ["git", "git"]),
+        ("npm install&&npm run build", ["npm", "npm"]),
+        ("git commit -m 'fix: a; b && c'", ["git"]),
+        ("ls; ; pwd", ["ls", "pwd"]),
     ]
 
     for cmd, expected in test_cases:
@@ -96,7 +100,7 @@ def test_validate_chmod():
     ]
 
     for cmd, should_allow, description in test_cases:
-        allowed, reason = validate_chmod_command(cmd)
+        allowed, reason = validate_chmod_command(shlex.split(cmd))
         if allowed == should_allow:
             print(f"  PASS: {cmd!r} ({description})")
             passed += 1
@@ -135,7 +139,7 @@ def test_validate_init_script():
     ]
 
     for cmd, should_allow, description in test_cases:
-        allowed, reason = validate_init_script(cmd)
+        allowed, reason = validate_init_script(shlex.split(cmd))
         if allowed == should_allow:
             print(f"  PASS: {cmd!r} ({description})")
             passed += 1
@@ -207,6 +211,13 @@ def main():
         "./setup.sh",
         "./malicious.sh",
         "bash script.sh",
+        # Repeated sensitive commands - each one validated on its own segment
+        "pkill node && pkill bash",
+        "chmod +x init.sh && chmod 777 init.sh",
+        "ls | pkill bash",
+        # Chain operators without surrounding spaces
+        "ls&&pkill bash",
+        "ls;chmod 777 init.sh",
     ]
 
     for cmd in dangerous:
@@ -252,6 +263,9 @@ def main():
         # Chained commands
         "npm install && npm run build",
         "ls | grep test",
+        # Separators inside quoted arguments
+        "git commit -m 'fix: a; b'",
+        'git commit -m "feat: x && y"',
         # Full paths
         "/usr/local/bin/node app.js",
         # chmod +x (allowed)